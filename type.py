@@ -2,13 +2,17 @@ import time
 import random
 import asyncio
 import statistics
+import itertools
+import functools
 import sys
 import argparse
+from collections import deque
 from textual.app import App, ComposeResult
 from textual.containers import Container
 from textual.widgets import Header, Footer, Static, Input
 from textual import events
 from textual.reactive import reactive
+from textual.message import Message
 
 SENTENCES = [
     "The quick brown fox jumps over the lazy dog.",
@@ -22,94 +26,191 @@ SENTENCES = [
     "Time flies like an arrow; fruit flies like a banana.",
     "Better late than never.",
 ]
+SENTENCE_WORDS = [sentence.split() for sentence in SENTENCES]
+
+# The word set is fixed, so every colored form is built once at import
+GREEN_WORDS = {word: f"[green]{word}[/green]" for words in SENTENCE_WORDS for word in words}
+RED_WORDS = {word: f"[red]{word}[/red]" for words in SENTENCE_WORDS for word in words}
+GRAY_WORDS = {word: f"[gray]{word}[/gray]" for words in SENTENCE_WORDS for word in words}
 
 DEFAULT_TIME = 60  # 60 seconds
+NS_PER_SECOND = 1_000_000_000
+HEADER_REFRESH_INTERVAL = 0.15  # seconds; word submissions within this window share one header redraw
+VISIBLE_TYPED_WORDS = 20  # typed words kept on screen behind the current one
+VISIBLE_UPCOMING_WORDS = 40  # untyped words shown ahead of the current one
+WORD_POOL_PASSES = 10  # shuffled passes over SENTENCES prepared at once
+REFILL_WORDS = 60  # words handed out by each generate_text call
+REFILL_THRESHOLD = VISIBLE_UPCOMING_WORDS + 2  # top up before the upcoming window can run short
+
+GRAPH_WIDTH = 24  # 24 characters to represent 0-120 WPM (5 WPM per character)
+# Every possible bar and marker line, indexed by the number of filled cells
+GRAPH_BARS = tuple(
+    "█" * filled + ("▒" + "░" * (GRAPH_WIDTH - filled - 1) if filled < GRAPH_WIDTH else "")
+    for filled in range(GRAPH_WIDTH + 1)
+)
+GRAPH_MARKERS = tuple(" " * position + "▲" for position in range(GRAPH_WIDTH + 1))
+GRAPH_TICKS = "│    │    │    │    │\n"
+GRAPH_HEADER = "Your performance:\n0    30   60   90   120 WPM\n" + GRAPH_TICKS
+
+# This is a rough estimation. You might want to use actual typing speed distribution data.
+# Every 30 WPM band adds 25 percentile points, so the bands collapse to one clamped line,
+# tabulated per whole WPM up to where it saturates at 99.
+PERCENTILE_MAX_WPM = 120
+PERCENTILE_TABLE = tuple(min(max(wpm * 25 / 30, 1), 99) for wpm in range(PERCENTILE_MAX_WPM + 1))
+
+def wpm_to_percentile(wpm):
+    return PERCENTILE_TABLE[min(max(int(wpm), 0), PERCENTILE_MAX_WPM)]
+
+@functools.lru_cache(maxsize=256)
+def create_percentile_graph(wpm, percentile):
+    filled = min(int(wpm / 5), GRAPH_WIDTH)
+    graph = f"{GRAPH_HEADER}{GRAPH_BARS[filled]}│\n{GRAPH_TICKS}"
+    
+    # Add marker for user's WPM
+    graph += f"{GRAPH_MARKERS[filled]}\n"
+    
+    graph += f"Your WPM: {wpm} (Estimated {percentile:.0f}th percentile)\n\n"
+    
+    # Add performance interpretation
+    if percentile < 25:
+        graph += "Keep practicing! You're on your way to improvement."
+    elif percentile < 50:
+        graph += "Good effort! You're making progress."
+    elif percentile < 75:
+        graph += "Great job! You're above average."
+    else:
+        graph += "Excellent! You're among the top performers."
+    
+    return graph
 
 class TypingTest(Static):
-    words = reactive([])
-    current_word_index = reactive(0)
+    class Countdown(Message):
+        pass
+
     countdown = reactive(0)
 
     def __init__(self, test_duration, debug=False):
         super().__init__()
         self.debug = debug
         self.test_duration = test_duration
-        self.countdown = test_duration  # Initialize without reactive()
-        self.text = self.generate_text()
-        self.words = self.text.split()
-        self.start_time = None
+        self._sentences = list(SENTENCE_WORDS)  # shuffled in place for every pool pass
+        self._loop = None  # event loop the countdown callbacks are scheduled on
+        self.tick_handle = None
+        self.end_handle = None
+        self.reset()
+
+    def reset(self):
+        if self.tick_handle:
+            self.tick_handle.cancel()
+        if self.end_handle:
+            self.end_handle.cancel()
+        self.countdown = self.test_duration  # Initialize without reactive()
+        self._pool = []  # start each test on a freshly shuffled pool, at a sentence boundary
+        self._pool_index = 0
+        # Only what is on screen is kept: the current word followed by the untyped words,
+        # and the colored markup of the most recently typed words
+        self.untyped = deque(self.generate_text())
+        self.typed_markup = deque(maxlen=VISIBLE_TYPED_WORDS)
+        self.start_ns = None  # time.monotonic_ns() of the first keystroke
+        self.deadline_ns = None
         self.words_typed = 0
-        self.timer_task = None
+        self.tick_handle = None
+        self.end_handle = None
         self.correct_words = 0
         self.incorrect_words = 0
         self.total_keystrokes = 0
+        # Before mount there is nothing to redraw; on_mount renders the first frame
+        if self.is_mounted:
+            self.update_content()
 
     def generate_text(self):
-        return " ".join(random.sample(SENTENCES, k=len(SENTENCES)))
+        if self._pool_index >= len(self._pool):
+            self._pool = []
+            for _ in range(WORD_POOL_PASSES):
+                random.shuffle(self._sentences)
+                self._pool.extend(itertools.chain.from_iterable(self._sentences))
+            self._pool_index = 0
+        batch = self._pool[self._pool_index:self._pool_index + REFILL_WORDS]
+        self._pool_index += REFILL_WORDS
+        return batch
 
     def check_word(self, typed_word: str):
         self.total_keystrokes += len(typed_word) + 1  # +1 for space
-        if not self.start_time:
-            self.start_time = time.time()
 
-        correct = typed_word.strip() == self.words[self.current_word_index]
-        if correct:
+        # Bind the hot attribute once
+        untyped = self.untyped
+        word = untyped.popleft()
+        if typed_word.strip() == word:
             self.correct_words += 1
-            self.words[self.current_word_index] = f"[green]{self.words[self.current_word_index]}[/green]"
+            self.typed_markup.append(GREEN_WORDS[word])
         else:
             self.incorrect_words += 1
-            self.words[self.current_word_index] = f"[red]{self.words[self.current_word_index]}[/red]"
-        
-        self.current_word_index += 1
+            self.typed_markup.append(RED_WORDS[word])
         self.words_typed += 1
 
-        if self.current_word_index >= len(self.words):
-            self.words.extend(self.generate_text().split())
+        if len(untyped) < REFILL_THRESHOLD:
+            untyped.extend(self.generate_text())
 
         self.update_content()
         if self.debug:
             self.notify("words")
 
     def update_content(self):
-        content = ""
-        if self.current_word_index < len(self.words):
-            content = f"[gray]{self.words[self.current_word_index]}[/gray] "
-        content += " ".join(self.words[self.current_word_index + 1:])
-        if self.current_word_index > 0:
-            content = " ".join(self.words[:self.current_word_index]) + " " + content
-        self.update(content.strip())
+        # Only render a window around the current word so the markup stays small in long sessions
+        untyped = self.untyped
+        parts = ["…"] if self.words_typed > VISIBLE_TYPED_WORDS else []
+        parts.extend(self.typed_markup)
+        parts.append(GRAY_WORDS[untyped[0]])
+        parts.extend(itertools.islice(untyped, 1, VISIBLE_UPCOMING_WORDS + 1))
+        if len(untyped) > VISIBLE_UPCOMING_WORDS + 1:
+            parts.append("…")
+        # One join builds the whole frame; no intermediate strings or strip()
+        self.update(" ".join(parts))
 
     def calculate_wpm(self):
-        if self.start_time:
-            elapsed_time = time.time() - self.start_time
-            minutes = elapsed_time / 60
-            return int(self.words_typed / minutes)
+        if self.start_ns:
+            elapsed_ns = time.monotonic_ns() - self.start_ns
+            if elapsed_ns < 1_000_000:  # too early (under 1 ms) to give a meaningful rate
+                return 0
+            return self.words_typed * 60 * NS_PER_SECOND // elapsed_ns
         return 0
 
-    async def start_countdown(self):
-        if not self.start_time:
-            self.start_time = time.time()
-            self.timer_task = asyncio.create_task(self.countdown_timer())
-
-    async def countdown_timer(self):
-        while self.countdown > 0:
-            await asyncio.sleep(1)
-            self.update_countdown()
+    def start_countdown(self):
+        if not self.start_ns:
+            self.start_ns = time.monotonic_ns()
+            self.deadline_ns = self.start_ns + self.test_duration * NS_PER_SECOND
+            self._loop = asyncio.get_running_loop()
+            self.end_handle = self._loop.call_later(self.test_duration, self.end_test)
+            self.tick_handle = self._loop.call_later(1, self.update_countdown)
 
     def update_countdown(self):
-        elapsed = int(time.time() - self.start_time)
-        self.countdown = max(self.test_duration - elapsed, 0)
-        if self.debug:
-            self.notify("countdown")
-        if self.countdown == 0:
-            self.show_end_screen()
-
-    def show_end_screen(self):
-        final_wpm = self.calculate_wpm()
+        remaining_ns = self.deadline_ns - time.monotonic_ns()
+        countdown = max(-(-remaining_ns // NS_PER_SECOND), 0)  # whole seconds, rounded up
+        if countdown != self.countdown:
+            self.countdown = countdown
+            self.post_message(self.Countdown())
+            if self.debug:
+                self.notify("countdown")
+        if countdown > 0:
+            # Wake up when the displayed second next changes rather than one second from now
+            delay = (remaining_ns % NS_PER_SECOND or NS_PER_SECOND) / NS_PER_SECOND
+            self.tick_handle = self._loop.call_later(delay, self.update_countdown)
+
+    def end_test(self):
+        self.tick_handle.cancel()
+        self.countdown = 0
+        self.post_message(self.Countdown())
+        self.show_end_screen()
+
+    def final_stats(self):
+        wpm = self.calculate_wpm()
         total_words = self.correct_words + self.incorrect_words
         accuracy = (self.correct_words / total_words) * 100 if total_words > 0 else 0
+        return wpm, accuracy, wpm_to_percentile(wpm)
 
-        graph = self.create_percentile_graph(final_wpm)
+    def show_end_screen(self):
+        final_wpm, accuracy, percentile = self.final_stats()
+        graph = create_percentile_graph(final_wpm, percentile)
 
         end_message = f"""
     Time's up! Here are your results:
@@ -124,57 +225,6 @@ class TypingTest(Static):
         """
         self.update(end_message)
 
-    def create_percentile_graph(self, wpm):
-        percentile = self.wpm_to_percentile(wpm)
-        graph = "Your performance:\n"
-        graph += "0    30   60   90   120 WPM\n"
-        graph += "│    │    │    │    │\n"
-        
-        total_width = 24  # 24 characters to represent 0-120 WPM (5 WPM per character)
-        filled = min(int(wpm / 5), total_width)
-        
-        bar = "█" * filled
-        if filled < total_width:
-            bar += "▒"
-            bar += "░" * (total_width - filled - 1)
-        
-        graph += f"{bar}│\n"
-        graph += "│    │    │    │    │\n"
-        
-        # Add marker for user's WPM
-        marker_position = min(int(wpm / 5), total_width)
-        marker = " " * marker_position + "▲"
-        graph += f"{marker}\n"
-        
-        graph += f"Your WPM: {wpm} (Estimated {percentile:.0f}th percentile)\n\n"
-        
-        # Add performance interpretation
-        if percentile < 25:
-            graph += "Keep practicing! You're on your way to improvement."
-        elif percentile < 50:
-            graph += "Good effort! You're making progress."
-        elif percentile < 75:
-            graph += "Great job! You're above average."
-        else:
-            graph += "Excellent! You're among the top performers."
-        
-        return graph
-
-    def wpm_to_percentile(self, wpm):
-        # This is a rough estimation. You might want to use actual typing speed distribution data.
-        if wpm < 30:
-            return max(wpm / 30 * 25, 1)
-        elif wpm < 60:
-            return 25 + (wpm - 30) / 30 * 25
-        elif wpm < 90:
-            return 50 + (wpm - 60) / 30 * 25
-        else:
-            return min(75 + (wpm - 90) / 30 * 25, 99)
-
-    def notify(self, message: str) -> None:
-        if self.debug:
-            super().notify(message)
-
 class TerminalType(App):
     CSS = """
     Screen {
@@ -215,6 +265,7 @@ class TerminalType(App):
         super().__init__()
         self.typing_test = TypingTest(test_duration=test_duration, debug=debug)
         self.title = "Terminal Type"
+        self._header_dirty = False
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -237,15 +288,27 @@ class TerminalType(App):
             self.mount(HelpScreen())
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        if not self.typing_test.start_time:
-            asyncio.create_task(self.typing_test.start_countdown())
+        if not self.typing_test.start_ns:
+            self.typing_test.start_countdown()
 
-        if " " in event.value:
-            word = event.value.strip()
-            self.typing_test.check_word(word)
-            event.input.value = ""
-        
-        self.update_header()
+        # The input is cleared after every submitted word, so only a trailing space matters
+        if not event.value.endswith(" "):
+            return
+
+        word = event.value.strip()
+        self.typing_test.check_word(word)
+        event.input.value = ""
+        self.mark_header_dirty()
+
+    def mark_header_dirty(self):
+        if not self._header_dirty:
+            self._header_dirty = True
+            self.set_timer(HEADER_REFRESH_INTERVAL, self.flush_header)
+
+    def flush_header(self, force=False):
+        if self._header_dirty or force:
+            self._header_dirty = False
+            self.update_header()
 
     def update_header(self):
         wpm = self.typing_test.calculate_wpm()
@@ -258,14 +321,13 @@ class TerminalType(App):
         self.sub_title = f"WPM: {wpm} | Time Left: {countdown}s"
 
     def on_typing_test_countdown(self):
-        self.update_header()
-
-    def on_typing_test_words(self):
-        self.update_header()
+        # Countdown ticks (including the final one from end_test) redraw right away
+        self.flush_header(force=True)
 
 class HelpScreen(Static):
-    def compose(self) -> ComposeResult:
-        yield Static(
+    def __init__(self):
+        # Render the help text on this widget itself instead of mounting a child Static
+        super().__init__(
             "Terminal Type Help\n\n"
             "- Type the highlighted word in the input box\n"
             "- Press space to submit the word and move to the next one\n"